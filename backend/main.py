@@ -8,34 +8,60 @@ POST /api/auth/login               – Authenticate and receive a JWT
 GET  /api/auth/me                  – Return the current user profile
 POST /api/leccion/generar          – Generate a structured exercise via Google Gemini
 POST /api/leccion/{id}/completar   – Mark a lesson as completed
-GET  /api/leccion/lista            – List all lessons for the authenticated user
+GET  /api/leccion/lista            – List lessons (summaries) for the authenticated user
+GET  /api/leccion/{id}             – Return a single lesson with its full content
 GET  /api/progreso/{idioma}        – Get level progress for a language
 GET  /api/progreso                 – Get progress for all languages
 POST /api/tts                      – Generate audio from text using edge-tts
 POST /api/chat/local               – Chat with the local SLM tutor + grammar correction
 """
 
+import asyncio
 import hashlib
 import io
-import json
 import os
 import random
 import re
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
 from typing import Annotated
 
+import bcrypt
 import httpx
+import jwt
+import orjson
+import redis.asyncio as redis
+from cachetools import TTLCache
 from dotenv import load_dotenv
-from fastapi import Depends, FastAPI, HTTPException, status
+from fastapi import (
+    BackgroundTasks,
+    Depends,
+    FastAPI,
+    HTTPException,
+    Query,
+    Request,
+    status,
+)
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.responses import FileResponse, ORJSONResponse, StreamingResponse
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
-from passlib.context import CryptContext
-from sqlalchemy.orm import Session
-
-from database import Base, engine, get_db
+from jwt import InvalidTokenError
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer, make_transient
+
+from database import (
+    Base,
+    SessionLocal,
+    close_request_session,
+    engine,
+    get_db,
+    get_request_session,
+)
 from models import Conversacion, Leccion, Mensaje, ProgresoNivel, Usuario
 from schemas import (
     ChangePasswordRequest,
@@ -46,6 +72,7 @@ from schemas import (
     GenerarLeccionRequest,
     IDIOMAS_PERMITIDOS,
     LeccionResponse,
+    LeccionResumenResponse,
     LESSONS_TO_UNLOCK,
     LoginRequest,
     MensajeResponse,
@@ -63,9 +90,50 @@ from schemas import (
 load_dotenv(override=True)
 
 # ---------------------------------------------------------------------------
-# Create DB tables on startup
+# Shared HTTP client – pooled keep-alive connections to the LLM providers
+# ---------------------------------------------------------------------------
+_http_client = httpx.AsyncClient(
+    timeout=httpx.Timeout(60.0),
+    http2=True,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+)
+
+# ---------------------------------------------------------------------------
+# Lesson cache – generated exercises shared across users via Redis (optional)
+# ---------------------------------------------------------------------------
+# Without REDIS_URL every lesson is generated by the LLM, as before.
+_REDIS_URL = os.getenv("REDIS_URL", "")
+# Short socket timeouts: an unreachable Redis must fall through to the LLM
+# quickly instead of hanging the request until the OS TCP timeout.
+_redis = (
+    redis.Redis.from_url(_REDIS_URL, socket_connect_timeout=0.5, socket_timeout=0.5)
+    if _REDIS_URL
+    else None
+)
+_LESSON_CACHE_TTL = 7 * 24 * 3600
+# Cached exercises kept per (tipo, tema, nivel, idioma) so repeated requests
+# do not always return the very same exercise.
+LESSON_CACHE_VARIANTS = max(1, int(os.getenv("LESSON_CACHE_VARIANTS", "3")))
+
+# ---------------------------------------------------------------------------
+# Lifespan – optional table creation on startup, cleanup on shutdown
 # ---------------------------------------------------------------------------
-Base.metadata.create_all(bind=engine)
+# Set AUTO_CREATE_TABLES=0 where the schema is managed externally (e.g. with
+# Alembic) so that workers boot without touching the database.
+AUTO_CREATE_TABLES = os.getenv("AUTO_CREATE_TABLES", "1") == "1"
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if AUTO_CREATE_TABLES:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    yield
+    await _http_client.aclose()
+    if _redis is not None:
+        await _redis.aclose()
+    await engine.dispose()
+
 
 # ---------------------------------------------------------------------------
 # App & CORS
@@ -74,6 +142,8 @@ app = FastAPI(
     title="PolyIA API",
     description="Hybrid Language Tutor: cloud LLM for lessons, local SLM for chat.",
     version="2.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 ALLOWED_ORIGINS: list[str] = os.getenv(
@@ -89,36 +159,64 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def _request_session_scope(request: Request, call_next):
+    """Bind one DB session to the request and close it once it is handled."""
+    # call_next runs the route in a child task that inherits a *copy* of
+    # this context, so the session is bound here for both sides to share it.
+    get_request_session()
+    try:
+        return await call_next(request)
+    finally:
+        await close_request_session()
+
 # ---------------------------------------------------------------------------
 # Security helpers
 # ---------------------------------------------------------------------------
 SECRET_KEY: str = os.getenv("SECRET_KEY", "change-me-in-production-use-a-long-random-string")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "60"))
+_EXP_TTL = ACCESS_TOKEN_EXPIRE_MINUTES * 60  # seconds
+
+# bcrypt cost factor: every +1 doubles the CPU time of a hash/verify.  The
+# default of 10 (~100 ms) keeps login responsive while remaining expensive to
+# brute-force; raise it on hardware where that still fits the latency budget.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "10"))
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
+# Authenticated users cached by id so that repeated requests with the same
+# JWT skip the SELECT.  Entries are transient Usuario snapshots, unaffected by
+# a later rollback of the session that loaded them; the cache is bounded since
+# each entry may carry a profile photo.
+_USER_TTL = 30.0
+_USER_CACHE_SIZE = 1024
+_user_cache: TTLCache[int, Usuario] = TTLCache(maxsize=_USER_CACHE_SIZE, ttl=_USER_TTL)
+
 
 def _hash_password(plain: str) -> str:
-    return pwd_context.hash(plain)
+    return bcrypt.hashpw(plain.encode(), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode()
 
 
 def _verify_password(plain: str, hashed: str) -> bool:
-    return pwd_context.verify(plain, hashed)
+    return bcrypt.checkpw(plain.encode(), hashed.encode())
+
+
+def invalidate_user(user_id: int) -> None:
+    """Drop a cached user so the next request re-reads it from the database."""
+    _user_cache.pop(user_id, None)
 
 
 def _create_access_token(data: dict) -> str:
-    payload = data.copy()
-    payload["exp"] = datetime.now(timezone.utc) + timedelta(
-        minutes=ACCESS_TOKEN_EXPIRE_MINUTES
-    )
+    # "exp" is NumericDate (epoch seconds) on the wire; build it directly
+    payload = {**data, "exp": int(time.time()) + _EXP_TTL}
     return jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
 
 
-def _get_current_user(
+async def _get_current_user(
     token: Annotated[str, Depends(oauth2_scheme)],
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> Usuario:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -130,12 +228,20 @@ def _get_current_user(
         user_id: int | None = payload.get("sub")
         if user_id is None:
             raise credentials_exception
-    except JWTError:
+    except InvalidTokenError:
         raise credentials_exception
 
-    user = db.query(Usuario).filter(Usuario.id == int(user_id)).first()
+    user_id = int(user_id)
+    cached = _user_cache.get(user_id)
+    if cached is not None:
+        return cached
+
+    user = await db.get(Usuario, user_id)
     if user is None or not user.is_active:
         raise credentials_exception
+    # Detach from the request session: all columns are already loaded
+    make_transient(user)
+    _user_cache[user_id] = user
     return user
 
 
@@ -150,38 +256,38 @@ def _get_levels(idioma: str) -> list[str]:
     return NIVELES_CEFR
 
 
-def _get_current_level(db: Session, user_id: int, idioma: str) -> str:
+async def _get_current_level(db: AsyncSession, user_id: int, idioma: str) -> str:
     """Determine the highest unlocked level for a user in a language."""
     levels = _get_levels(idioma)
     for i, level in enumerate(levels):
         prog = (
-            db.query(ProgresoNivel)
-            .filter(
-                ProgresoNivel.usuario_id == user_id,
-                ProgresoNivel.idioma == idioma,
-                ProgresoNivel.nivel == level,
+            await db.execute(
+                select(ProgresoNivel).where(
+                    ProgresoNivel.usuario_id == user_id,
+                    ProgresoNivel.idioma == idioma,
+                    ProgresoNivel.nivel == level,
+                )
             )
-            .first()
-        )
+        ).scalar_one_or_none()
         if prog is None or prog.completadas < LESSONS_TO_UNLOCK:
             return level
     return levels[-1]
 
 
-def _get_unlocked_levels(db: Session, user_id: int, idioma: str) -> list[str]:
+async def _get_unlocked_levels(db: AsyncSession, user_id: int, idioma: str) -> list[str]:
     """Return the list of levels the user has access to."""
     levels = _get_levels(idioma)
     unlocked = [levels[0]]
     for i, level in enumerate(levels[:-1]):
         prog = (
-            db.query(ProgresoNivel)
-            .filter(
-                ProgresoNivel.usuario_id == user_id,
-                ProgresoNivel.idioma == idioma,
-                ProgresoNivel.nivel == level,
+            await db.execute(
+                select(ProgresoNivel).where(
+                    ProgresoNivel.usuario_id == user_id,
+                    ProgresoNivel.idioma == idioma,
+                    ProgresoNivel.nivel == level,
+                )
             )
-            .first()
-        )
+        ).scalar_one_or_none()
         if prog and prog.completadas >= LESSONS_TO_UNLOCK:
             unlocked.append(levels[i + 1])
         else:
@@ -231,28 +337,41 @@ TOPIC_EXERCISE_MAP: dict[str, list[str]] = {
 # Auth endpoints
 # ---------------------------------------------------------------------------
 @app.post("/api/auth/register", status_code=status.HTTP_201_CREATED)
-def register(payload: RegisterRequest, db: Session = Depends(get_db)) -> TokenResponse:
-    if db.query(Usuario).filter(Usuario.email == payload.email).first():
+async def register(payload: RegisterRequest, db: AsyncSession = Depends(get_db)) -> TokenResponse:
+    hashed_password = await asyncio.get_running_loop().run_in_executor(
+        None, _hash_password, payload.password
+    )
+    # Single round trip: an existing email makes the INSERT return no row
+    user_id = (
+        await db.execute(
+            pg_insert(Usuario)
+            .values(
+                email=payload.email,
+                hashed_password=hashed_password,
+                nombre=payload.nombre,
+            )
+            .on_conflict_do_nothing(index_elements=[Usuario.email])
+            .returning(Usuario.id)
+        )
+    ).scalar_one_or_none()
+    if user_id is None:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="El email ya está registrado.",
         )
-    user = Usuario(
-        email=payload.email,
-        hashed_password=_hash_password(payload.password),
-        nombre=payload.nombre,
-    )
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-    token = _create_access_token({"sub": str(user.id)})
-    return TokenResponse(access_token=token, usuario_id=user.id, nombre=user.nombre)
+    await db.commit()
+    token = _create_access_token({"sub": str(user_id)})
+    return TokenResponse(access_token=token, usuario_id=user_id, nombre=payload.nombre)
 
 
 @app.post("/api/auth/login")
-def login(payload: LoginRequest, db: Session = Depends(get_db)) -> TokenResponse:
-    user = db.query(Usuario).filter(Usuario.email == payload.email).first()
-    if not user or not _verify_password(payload.password, user.hashed_password):
+async def login(payload: LoginRequest, db: AsyncSession = Depends(get_db)) -> TokenResponse:
+    user = (
+        await db.execute(select(Usuario).where(Usuario.email == payload.email))
+    ).scalar_one_or_none()
+    if not user or not await asyncio.get_running_loop().run_in_executor(
+        None, _verify_password, payload.password, user.hashed_password
+    ):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Credenciales incorrectas.",
@@ -272,34 +391,41 @@ def me(current_user: Usuario = Depends(_get_current_user)):
 
 
 @app.put("/api/auth/profile")
-def update_profile(
+async def update_profile(
     payload: UpdateProfileRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: Usuario = Depends(_get_current_user),
 ):
     """Update the user's display name and/or profile picture."""
+    # current_user may be a cached, detached instance: edit this session's copy
+    user = await db.get(Usuario, current_user.id)
     if payload.nombre is not None:
-        current_user.nombre = payload.nombre.strip()
+        user.nombre = payload.nombre.strip()
     if payload.foto_perfil is not None:
-        current_user.foto_perfil = payload.foto_perfil
-    db.commit()
-    db.refresh(current_user)
+        user.foto_perfil = payload.foto_perfil
+    await db.commit()
+    await db.refresh(user)
+    invalidate_user(user.id)
     return {
-        "id": current_user.id,
-        "email": current_user.email,
-        "nombre": current_user.nombre,
-        "foto_perfil": current_user.foto_perfil,
+        "id": user.id,
+        "email": user.email,
+        "nombre": user.nombre,
+        "foto_perfil": user.foto_perfil,
     }
 
 
 @app.put("/api/auth/password")
-def change_password(
+async def change_password(
     payload: ChangePasswordRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: Usuario = Depends(_get_current_user),
 ):
     """Change the user's password. Requires current password + confirmation."""
-    if not _verify_password(payload.password_actual, current_user.hashed_password):
+    user = await db.get(Usuario, current_user.id)
+    loop = asyncio.get_running_loop()
+    if not await loop.run_in_executor(
+        None, _verify_password, payload.password_actual, user.hashed_password
+    ):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="La contraseña actual es incorrecta.",
@@ -309,8 +435,11 @@ def change_password(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="La nueva contraseña y la confirmación no coinciden.",
         )
-    current_user.hashed_password = _hash_password(payload.password_nueva)
-    db.commit()
+    user.hashed_password = await loop.run_in_executor(
+        None, _hash_password, payload.password_nueva
+    )
+    await db.commit()
+    invalidate_user(user.id)
     return {"message": "Contraseña actualizada correctamente."}
 
 
@@ -318,10 +447,15 @@ def change_password(
 # Lesson generation – Google Gemini only
 # ---------------------------------------------------------------------------
 
+@lru_cache(maxsize=1024)
 def _build_exercise_prompt(
     tipo: str, tema_cat: str, nivel: str, idioma: str
 ) -> str:
-    """Build a detailed prompt that tells Gemini to produce structured JSON."""
+    """
+    Build a detailed prompt that tells Gemini to produce structured JSON.
+
+    Pure function of a small, validated input space, so results are memoized.
+    """
     idioma_display = IDIOMA_DISPLAY.get(idioma, idioma)
     tema_display = TEMA_DISPLAY.get(tema_cat, tema_cat)
     tipo_display = TIPO_DISPLAY.get(tipo, tipo)
@@ -519,24 +653,94 @@ def _build_exercise_prompt(
     )
 
 
+# Not streamed: the exercise must be complete JSON before it can be validated,
+# post-processed and stored, so there is no useful first token to forward.
+def _google_model() -> str:
+    return os.getenv("GOOGLE_MODEL", "gemini-2.0-flash")
+
+
 async def _call_google(prompt: str) -> str:
     api_key = os.getenv("GOOGLE_API_KEY", "")
     if not api_key:
         raise HTTPException(status_code=503, detail="GOOGLE_API_KEY no configurada.")
-    model = os.getenv("GOOGLE_MODEL", "gemini-2.0-flash")
-    async with httpx.AsyncClient(timeout=90) as client:
-        resp = await client.post(
-            f"https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent?key={api_key}",
-            json={"contents": [{"parts": [{"text": prompt}]}]},
-        )
+    model = _google_model()
+    resp = await _http_client.post(
+        f"https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent?key={api_key}",
+        json={"contents": [{"parts": [{"text": prompt}]}]},
+        timeout=90,
+    )
     resp.raise_for_status()
-    return resp.json()["candidates"][0]["content"]["parts"][0]["text"]
+    return orjson.loads(resp.content)["candidates"][0]["content"]["parts"][0]["text"]
+
+
+def _extract_json_block(text: str) -> str | None:
+    """Return the first balanced ``{...}`` block in *text*, or None.
+
+    Single linear pass that skips braces inside JSON string literals, so long
+    LLM outputs never trigger regex backtracking.
+    """
+    start = text.find("{")
+    if start == -1:
+        return None
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start : i + 1]
+    return None
+
+
+def _lesson_cache_key(proveedor: str, model: str, prompt: str) -> str:
+    """
+    Redis key for one cached variant of a generated exercise.  Hashing the
+    model and the full prompt means editing either stops old entries from
+    being served.
+    """
+    variante = random.randrange(LESSON_CACHE_VARIANTS)
+    raw = f"{proveedor}|{model}|{variante}|{prompt}"
+    return "less:" + hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+async def _get_cached_lesson(key: str) -> str | None:
+    """Return a cached exercise, or None on a miss or when Redis is unavailable."""
+    if _redis is None:
+        return None
+    try:
+        cached = await _redis.get(key)
+    except redis.RedisError:
+        return None  # A cache outage must not block lesson generation
+    return cached.decode() if cached is not None else None
+
+
+async def _store_cached_lesson(key: str, contenido: str) -> None:
+    """Cache a freshly generated exercise for _LESSON_CACHE_TTL seconds."""
+    if _redis is None:
+        return
+    try:
+        await _redis.setex(key, _LESSON_CACHE_TTL, contenido)
+    except redis.RedisError:
+        pass
 
 
 @app.post("/api/leccion/generar", response_model=LeccionResponse)
 async def generar_leccion(
     payload: GenerarLeccionRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: Usuario = Depends(_get_current_user),
 ) -> LeccionResponse:
     """Generate a structured interactive exercise via Google Gemini."""
@@ -549,7 +753,7 @@ async def generar_leccion(
         raise HTTPException(400, f"Categoría no válida. Opciones: {TEMAS_CATEGORIAS}")
 
     # Determine level
-    unlocked = _get_unlocked_levels(db, current_user.id, payload.idioma)
+    unlocked = await _get_unlocked_levels(db, current_user.id, payload.idioma)
     if payload.nivel:
         all_levels = _get_levels(payload.idioma)
         if payload.nivel not in all_levels:
@@ -563,40 +767,54 @@ async def generar_leccion(
             )
         nivel = payload.nivel
     else:
-        nivel = _get_current_level(db, current_user.id, payload.idioma)
+        nivel = await _get_current_level(db, current_user.id, payload.idioma)
 
     # Pick a random exercise type compatible with the topic
     compatible_types = TOPIC_EXERCISE_MAP.get(payload.tema_categoria, TIPOS_EJERCICIO)
     tipo = random.choice(compatible_types)
 
-    # Build prompt and call Gemini
+    # End the read transaction so no pooled connection is held during the call
+    await db.commit()
+
     prompt = _build_exercise_prompt(tipo, payload.tema_categoria, nivel, payload.idioma)
 
-    try:
-        raw_content = await _call_google(prompt)
-    except httpx.HTTPStatusError as exc:
-        raise HTTPException(
-            status_code=502,
-            detail=f"Error del proveedor de IA: {exc.response.text}",
-        ) from exc
-
-    # Try to extract clean JSON from the response
-    json_match = re.search(r"\{.*\}", raw_content, re.DOTALL)
-    if json_match:
-        contenido = json_match.group()
+    # Same prompt and model -> reuse an exercise generated earlier, if cached
+    cache_key = _lesson_cache_key("google", _google_model(), prompt)
+    contenido = await _get_cached_lesson(cache_key)
+
+    if contenido is None:
+        # Call Gemini
         try:
-            json.loads(contenido)
-        except json.JSONDecodeError:
+            raw_content = await _call_google(prompt)
+        except httpx.HTTPStatusError as exc:
+            raise HTTPException(
+                status_code=502,
+                detail=f"Error del proveedor de IA: {exc.response.text}",
+            ) from exc
+
+        # Try to extract clean JSON from the response
+        contenido = _extract_json_block(raw_content)
+        cacheable = contenido is not None
+        if cacheable:
+            try:
+                orjson.loads(contenido)
+            except orjson.JSONDecodeError:
+                cacheable = False
+        if not cacheable:
             contenido = raw_content
-    else:
-        contenido = raw_content
 
-    # For comprension_auditiva: generate and cache TTS audio files
-    if payload.tema_categoria == "comprension_auditiva":
-        try:
-            contenido = await _postprocess_audio(contenido, payload.idioma, tipo)
-        except Exception:
-            pass  # If audio generation fails, keep the lesson without audio
+        # For comprension_auditiva: generate and cache TTS audio files
+        if payload.tema_categoria == "comprension_auditiva":
+            try:
+                contenido = await _postprocess_audio(contenido, payload.idioma, tipo)
+            except Exception:
+                # If audio generation fails, keep the lesson without audio,
+                # but do not share that audio-less version through the cache
+                cacheable = False
+
+        # Audio files live on disk in audio_cache, so their URLs stay valid
+        if cacheable:
+            await _store_cached_lesson(cache_key, contenido)
 
     tema_display = TEMA_DISPLAY.get(payload.tema_categoria, payload.tema_categoria)
     tipo_display = TIPO_DISPLAY.get(tipo, tipo)
@@ -613,24 +831,26 @@ async def generar_leccion(
         usuario_id=current_user.id,
     )
     db.add(leccion)
-    db.commit()
-    db.refresh(leccion)
+    # id / created_at come back in the INSERT's RETURNING clause; no refresh
+    await db.commit()
     return LeccionResponse.model_validate(leccion)
 
 
 @app.post("/api/leccion/{leccion_id}/completar", response_model=LeccionResponse)
-def completar_leccion(
+async def completar_leccion(
     leccion_id: int,
     payload: CompletarLeccionRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: Usuario = Depends(_get_current_user),
 ) -> LeccionResponse:
     """Mark a lesson as completed and update progress."""
     leccion = (
-        db.query(Leccion)
-        .filter(Leccion.id == leccion_id, Leccion.usuario_id == current_user.id)
-        .first()
-    )
+        await db.execute(
+            select(Leccion).where(
+                Leccion.id == leccion_id, Leccion.usuario_id == current_user.id
+            )
+        )
+    ).scalar_one_or_none()
     if not leccion:
         raise HTTPException(404, "Lección no encontrada.")
     if leccion.completada:
@@ -642,14 +862,14 @@ def completar_leccion(
 
     # Update progress tracking
     prog = (
-        db.query(ProgresoNivel)
-        .filter(
-            ProgresoNivel.usuario_id == current_user.id,
-            ProgresoNivel.idioma == leccion.idioma,
-            ProgresoNivel.nivel == leccion.nivel,
+        await db.execute(
+            select(ProgresoNivel).where(
+                ProgresoNivel.usuario_id == current_user.id,
+                ProgresoNivel.idioma == leccion.idioma,
+                ProgresoNivel.nivel == leccion.nivel,
+            )
         )
-        .first()
-    )
+    ).scalar_one_or_none()
     if not prog:
         prog = ProgresoNivel(
             usuario_id=current_user.id,
@@ -666,24 +886,55 @@ def completar_leccion(
     existing_topics.add(leccion.tema_categoria)
     prog.temas_completados = ",".join(sorted(existing_topics))
 
-    db.commit()
-    db.refresh(leccion)
+    await db.commit()
+    await db.refresh(leccion)
     return LeccionResponse.model_validate(leccion)
 
 
-@app.get("/api/leccion/lista", response_model=list[LeccionResponse])
-def listar_lecciones(
-    db: Session = Depends(get_db),
+@app.get("/api/leccion/lista", response_model=list[LeccionResumenResponse])
+async def listar_lecciones(
+    limit: int = Query(default=20, ge=1, le=100),
+    before_id: int | None = None,
+    idioma: str | None = None,
+    db: AsyncSession = Depends(get_db),
     current_user: Usuario = Depends(_get_current_user),
-) -> list[LeccionResponse]:
-    """Return all lessons for the authenticated user, newest first."""
-    lecciones = (
-        db.query(Leccion)
-        .filter(Leccion.usuario_id == current_user.id)
-        .order_by(Leccion.created_at.desc())
-        .all()
+) -> list[LeccionResumenResponse]:
+    """
+    Return one page of lesson summaries for the authenticated user, newest
+    first, optionally limited to one ``idioma``.  Pass the last ``id``
+    received as ``before_id`` to get the next page.
+    """
+    stmt = (
+        select(Leccion)
+        .options(defer(Leccion.contenido), defer(Leccion.resultado_json))
+        .where(Leccion.usuario_id == current_user.id)
     )
-    return [LeccionResponse.model_validate(l) for l in lecciones]
+    if idioma is not None:
+        stmt = stmt.where(Leccion.idioma == idioma)
+    if before_id is not None:
+        stmt = stmt.where(Leccion.id < before_id)
+    stmt = stmt.order_by(Leccion.id.desc()).limit(limit)
+    lecciones = (await db.execute(stmt)).scalars().all()
+    return [LeccionResumenResponse.model_validate(l) for l in lecciones]
+
+
+@app.get("/api/leccion/{leccion_id}", response_model=LeccionResponse)
+async def obtener_leccion(
+    leccion_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: Usuario = Depends(_get_current_user),
+) -> LeccionResponse:
+    """Return a single lesson, including its exercise content."""
+    leccion = (
+        await db.execute(
+            select(Leccion).where(
+                Leccion.id == leccion_id, Leccion.usuario_id == current_user.id
+            )
+        )
+    ).scalar_one_or_none()
+    if not leccion:
+        raise HTTPException(404, "Lección no encontrada.")
+    return LeccionResponse.model_validate(leccion)
 
 
 # ---------------------------------------------------------------------------
@@ -691,27 +942,27 @@ def listar_lecciones(
 # ---------------------------------------------------------------------------
 
 @app.get("/api/progreso/{idioma}", response_model=ProgresoResponse)
-def obtener_progreso(
+async def obtener_progreso(
     idioma: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: Usuario = Depends(_get_current_user),
 ) -> ProgresoResponse:
     """Get the user's progress for a specific language."""
     if idioma not in IDIOMAS_PERMITIDOS:
         raise HTTPException(400, f"Idioma no soportado. Opciones: {IDIOMAS_PERMITIDOS}")
 
-    nivel_actual = _get_current_level(db, current_user.id, idioma)
-    unlocked = _get_unlocked_levels(db, current_user.id, idioma)
+    nivel_actual = await _get_current_level(db, current_user.id, idioma)
+    unlocked = await _get_unlocked_levels(db, current_user.id, idioma)
 
     prog = (
-        db.query(ProgresoNivel)
-        .filter(
-            ProgresoNivel.usuario_id == current_user.id,
-            ProgresoNivel.idioma == idioma,
-            ProgresoNivel.nivel == nivel_actual,
+        await db.execute(
+            select(ProgresoNivel).where(
+                ProgresoNivel.usuario_id == current_user.id,
+                ProgresoNivel.idioma == idioma,
+                ProgresoNivel.nivel == nivel_actual,
+            )
         )
-        .first()
-    )
+    ).scalar_one_or_none()
 
     completadas = prog.completadas if prog else 0
     temas = [t for t in (prog.temas_completados.split(",") if prog else []) if t]
@@ -727,24 +978,24 @@ def obtener_progreso(
 
 
 @app.get("/api/progreso", response_model=list[ProgresoResponse])
-def obtener_todo_progreso(
-    db: Session = Depends(get_db),
+async def obtener_todo_progreso(
+    db: AsyncSession = Depends(get_db),
     current_user: Usuario = Depends(_get_current_user),
 ) -> list[ProgresoResponse]:
     """Get progress for all languages."""
     result = []
     for idioma in IDIOMAS_PERMITIDOS:
-        nivel_actual = _get_current_level(db, current_user.id, idioma)
-        unlocked = _get_unlocked_levels(db, current_user.id, idioma)
+        nivel_actual = await _get_current_level(db, current_user.id, idioma)
+        unlocked = await _get_unlocked_levels(db, current_user.id, idioma)
         prog = (
-            db.query(ProgresoNivel)
-            .filter(
-                ProgresoNivel.usuario_id == current_user.id,
-                ProgresoNivel.idioma == idioma,
-                ProgresoNivel.nivel == nivel_actual,
+            await db.execute(
+                select(ProgresoNivel).where(
+                    ProgresoNivel.usuario_id == current_user.id,
+                    ProgresoNivel.idioma == idioma,
+                    ProgresoNivel.nivel == nivel_actual,
+                )
             )
-            .first()
-        )
+        ).scalar_one_or_none()
         completadas = prog.completadas if prog else 0
         temas = [t for t in (prog.temas_completados.split(",") if prog else []) if t]
         result.append(ProgresoResponse(
@@ -791,16 +1042,18 @@ TIPO_LABELS = {
 
 
 @app.get("/api/estadisticas")
-def obtener_estadisticas(
-    db: Session = Depends(get_db),
+async def obtener_estadisticas(
+    db: AsyncSession = Depends(get_db),
     current_user: Usuario = Depends(_get_current_user),
 ):
     """Return user statistics: weekly activity + global summary."""
     all_lessons = (
-        db.query(Leccion)
-        .filter(Leccion.usuario_id == current_user.id)
-        .all()
-    )
+        await db.execute(
+            select(Leccion)
+            .options(defer(Leccion.contenido), defer(Leccion.resultado_json))
+            .where(Leccion.usuario_id == current_user.id)
+        )
+    ).scalars().all()
     completed_lessons = [l for l in all_lessons if l.completada]
 
     # ── Weekly activity (last 7 days) ──
@@ -935,8 +1188,8 @@ async def _generate_cached_audio(text: str, idioma: str) -> str:
 async def _postprocess_audio(contenido_json: str, idioma: str, tipo: str) -> str:
     """For comprension_auditiva lessons, generate audio files and inject URLs."""
     try:
-        data = json.loads(contenido_json)
-    except json.JSONDecodeError:
+        data = orjson.loads(contenido_json)
+    except orjson.JSONDecodeError:
         return contenido_json
 
     if tipo == "multiple_choice":
@@ -958,7 +1211,7 @@ async def _postprocess_audio(contenido_json: str, idioma: str, tipo: str) -> str
                 fname = await _generate_cached_audio(audio_text, idioma)
                 ej["audio_url"] = f"/api/audio/{fname}"
 
-    return json.dumps(data, ensure_ascii=False)
+    return orjson.dumps(data).decode()
 
 
 @app.get("/api/audio/{filename}")
@@ -1008,6 +1261,10 @@ LOCAL_MODEL_NAME: str = os.getenv("LOCAL_MODEL_NAME", "qwen3:8b")
 MAX_CONVERSATIONS = 5
 CONTEXT_MESSAGES = 6  # last N messages sent as context to LLM
 
+# Built once and executed with bound parameters, so the compiled form is
+# reused from SQLAlchemy's statement cache on every chat turn.
+_INSERT_MENSAJE = insert(Mensaje)
+
 
 def _build_chat_prompt(
     mensaje: str,
@@ -1063,24 +1320,23 @@ def _build_chat_prompt(
 # ── Conversation CRUD ─────────────────────────────────────────────────
 
 @app.get("/api/chat/conversaciones")
-def list_conversations(
-    db: Session = Depends(get_db),
+async def list_conversations(
+    db: AsyncSession = Depends(get_db),
     current_user: Usuario = Depends(_get_current_user),
 ):
     """List user's conversations (newest first, max 5)."""
     convos = (
-        db.query(Conversacion)
-        .filter(Conversacion.usuario_id == current_user.id)
-        .order_by(Conversacion.updated_at.desc())
-        .limit(MAX_CONVERSATIONS)
-        .all()
-    )
+        await db.execute(
+            select(Conversacion)
+            .where(Conversacion.usuario_id == current_user.id)
+            .order_by(Conversacion.updated_at.desc())
+            .limit(MAX_CONVERSATIONS)
+        )
+    ).scalars().all()
     result = []
     for c in convos:
-        msg_count = (
-            db.query(Mensaje)
-            .filter(Mensaje.conversacion_id == c.id)
-            .count()
+        msg_count = await db.scalar(
+            select(func.count(Mensaje.id)).where(Mensaje.conversacion_id == c.id)
         )
         result.append({
             "id": c.id,
@@ -1093,30 +1349,33 @@ def list_conversations(
 
 
 @app.post("/api/chat/conversacion")
-def create_conversation(
-    db: Session = Depends(get_db),
+async def create_conversation(
+    db: AsyncSession = Depends(get_db),
     current_user: Usuario = Depends(_get_current_user),
 ):
     """Create a new conversation. Enforces max 5: auto-deletes oldest."""
-    existing = (
-        db.query(Conversacion)
-        .filter(Conversacion.usuario_id == current_user.id)
-        .order_by(Conversacion.updated_at.desc())
-        .all()
+    existing = list(
+        (
+            await db.execute(
+                select(Conversacion)
+                .where(Conversacion.usuario_id == current_user.id)
+                .order_by(Conversacion.updated_at.desc())
+            )
+        ).scalars()
     )
     # Delete oldest if at limit
     while len(existing) >= MAX_CONVERSATIONS:
         oldest = existing.pop()
-        db.delete(oldest)
-    db.flush()
+        await db.delete(oldest)
+    await db.flush()
 
     conv = Conversacion(
         titulo="Nueva conversación",
         usuario_id=current_user.id,
     )
     db.add(conv)
-    db.commit()
-    db.refresh(conv)
+    # id / created_at / updated_at come back in the INSERT's RETURNING clause
+    await db.commit()
     return {
         "id": conv.id,
         "titulo": conv.titulo,
@@ -1127,25 +1386,28 @@ def create_conversation(
 
 
 @app.get("/api/chat/conversacion/{conv_id}")
-def get_conversation_messages(
+async def get_conversation_messages(
     conv_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: Usuario = Depends(_get_current_user),
 ):
     """Get all messages for a conversation."""
     conv = (
-        db.query(Conversacion)
-        .filter(Conversacion.id == conv_id, Conversacion.usuario_id == current_user.id)
-        .first()
-    )
+        await db.execute(
+            select(Conversacion).where(
+                Conversacion.id == conv_id, Conversacion.usuario_id == current_user.id
+            )
+        )
+    ).scalar_one_or_none()
     if not conv:
         raise HTTPException(status_code=404, detail="Conversación no encontrada.")
     msgs = (
-        db.query(Mensaje)
-        .filter(Mensaje.conversacion_id == conv_id)
-        .order_by(Mensaje.created_at.asc())
-        .all()
-    )
+        await db.execute(
+            select(Mensaje)
+            .where(Mensaje.conversacion_id == conv_id)
+            .order_by(Mensaje.created_at.asc())
+        )
+    ).scalars().all()
     return [
         {
             "id": m.id,
@@ -1158,94 +1420,136 @@ def get_conversation_messages(
 
 
 @app.delete("/api/chat/conversacion/{conv_id}")
-def delete_conversation(
+async def delete_conversation(
     conv_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: Usuario = Depends(_get_current_user),
 ):
     """Delete a conversation and its messages."""
     conv = (
-        db.query(Conversacion)
-        .filter(Conversacion.id == conv_id, Conversacion.usuario_id == current_user.id)
-        .first()
-    )
+        await db.execute(
+            select(Conversacion).where(
+                Conversacion.id == conv_id, Conversacion.usuario_id == current_user.id
+            )
+        )
+    ).scalar_one_or_none()
     if not conv:
         raise HTTPException(status_code=404, detail="Conversación no encontrada.")
-    db.delete(conv)
-    db.commit()
+    await db.delete(conv)
+    await db.commit()
     return {"message": "Conversación eliminada."}
 
 
 # ── Chat with LLM ─────────────────────────────────────────────────────
 
+async def _persist_mensaje(
+    conversacion_id: int,
+    usuario_id: int,
+    texto_usuario: str,
+    respuesta_ia: str,
+    titulo: str | None = None,
+) -> None:
+    """Store a chat turn (and the new conversation title) after the reply is sent."""
+    # Runs after the response, once the request-scoped session is closed
+    async with SessionLocal() as db:
+        if titulo is not None:
+            await db.execute(
+                update(Conversacion)
+                .where(Conversacion.id == conversacion_id)
+                .values(titulo=titulo)
+            )
+        await db.execute(
+            _INSERT_MENSAJE,
+            {
+                "texto_usuario": texto_usuario,
+                "respuesta_ia": respuesta_ia,
+                "usuario_id": usuario_id,
+                "conversacion_id": conversacion_id,
+            },
+        )
+        await db.commit()
+
+
 @app.post("/api/chat/local", response_model=ChatResponse)
 async def chat_local(
     payload: ChatRequest,
-    db: Session = Depends(get_db),
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
     current_user: Usuario = Depends(_get_current_user),
 ) -> ChatResponse:
     """
     Send a message to the local SLM (via Ollama).
-    Messages are persisted to a conversation. History is sent as context.
+    Messages are persisted to a conversation in the background once the
+    reply has been sent. History is sent as context.
     """
     # Resolve or create conversation
     conv = None
     if payload.conversacion_id:
         conv = (
-            db.query(Conversacion)
-            .filter(
-                Conversacion.id == payload.conversacion_id,
-                Conversacion.usuario_id == current_user.id,
+            await db.execute(
+                select(Conversacion).where(
+                    Conversacion.id == payload.conversacion_id,
+                    Conversacion.usuario_id == current_user.id,
+                )
             )
-            .first()
-        )
+        ).scalar_one_or_none()
     if not conv:
         # Auto-create and enforce limit
-        existing = (
-            db.query(Conversacion)
-            .filter(Conversacion.usuario_id == current_user.id)
-            .order_by(Conversacion.updated_at.desc())
-            .all()
+        existing = list(
+            (
+                await db.execute(
+                    select(Conversacion)
+                    .where(Conversacion.usuario_id == current_user.id)
+                    .order_by(Conversacion.updated_at.desc())
+                )
+            ).scalars()
         )
         while len(existing) >= MAX_CONVERSATIONS:
             oldest = existing.pop()
-            db.delete(oldest)
-        db.flush()
+            await db.delete(oldest)
+        await db.flush()
         conv = Conversacion(
             titulo=payload.mensaje[:80],
             usuario_id=current_user.id,
         )
         db.add(conv)
-        db.flush()
+        await db.flush()
 
     # Load recent history
-    recent = (
-        db.query(Mensaje)
-        .filter(Mensaje.conversacion_id == conv.id)
-        .order_by(Mensaje.created_at.desc())
-        .limit(CONTEXT_MESSAGES)
-        .all()
+    recent = list(
+        (
+            await db.execute(
+                select(Mensaje)
+                .where(Mensaje.conversacion_id == conv.id)
+                .order_by(Mensaje.created_at.desc())
+                .limit(CONTEXT_MESSAGES)
+            )
+        ).scalars()
     )
     recent.reverse()
     history = [{"user": m.texto_usuario, "ai": m.respuesta_ia or ""} for m in recent]
 
+    # Store a newly created conversation and end the transaction, so no pooled
+    # connection is held while waiting on the model
+    await db.commit()
+
     # Build prompt
     leccion_dict = payload.leccion_adjunta.model_dump() if payload.leccion_adjunta else None
     prompt = _build_chat_prompt(payload.mensaje, history, leccion_dict)
 
     respuesta_texto = ""
     try:
-        async with httpx.AsyncClient(timeout=120) as client:
-            resp = await client.post(
-                LOCAL_MODEL_URL,
-                json={
-                    "model": LOCAL_MODEL_NAME,
-                    "prompt": prompt,
-                    "stream": False,
-                },
-            )
+        resp = await _http_client.post(
+            LOCAL_MODEL_URL,
+            json={
+                "model": LOCAL_MODEL_NAME,
+                "prompt": prompt,
+                "stream": False,
+            },
+            timeout=120,
+        )
         resp.raise_for_status()
-        respuesta_texto = resp.json().get("response", "")
+        respuesta_texto = orjson.loads(resp.content).get("response", "")
     except (httpx.ConnectError, httpx.HTTPStatusError):
         respuesta_texto = (
             "El modelo local no está disponible. "
@@ -1253,28 +1557,19 @@ async def chat_local(
             f"`ollama pull {LOCAL_MODEL_NAME}`."
         )
 
-    # Save message
-    mensaje_db = Mensaje(
-        texto_usuario=payload.mensaje,
-        respuesta_ia=respuesta_texto,
-        usuario_id=current_user.id,
-        conversacion_id=conv.id,
+    # Title the conversation after its first message (no history = no messages)
+    titulo = payload.mensaje[:80]
+    background_tasks.add_task(
+        _persist_mensaje,
+        conv.id,
+        current_user.id,
+        payload.mensaje,
+        respuesta_texto,
+        titulo if not recent and conv.titulo != titulo else None,
     )
-    db.add(mensaje_db)
 
-    # Update conversation title from first message
-    msg_count = db.query(Mensaje).filter(Mensaje.conversacion_id == conv.id).count()
-    if msg_count == 0:
-        conv.titulo = payload.mensaje[:80]
-
-    db.commit()
-    db.refresh(mensaje_db)
-
-    return ChatResponse(
-        respuesta=respuesta_texto,
-        mensaje_id=mensaje_db.id,
-        conversacion_id=conv.id,
-    )
+    # mensaje_id is unknown until the background insert runs
+    return ChatResponse(respuesta=respuesta_texto, conversacion_id=conv.id)
 
 
 # ---------------------------------------------------------------------------
@@ -14,6 +14,7 @@ from sqlalchemy import (
     Boolean,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
@@ -74,6 +75,10 @@ class Leccion(Base):
     """AI-generated interactive language lesson."""
 
     __tablename__ = "lecciones"
+    __table_args__ = (
+        # Serves the keyset-paginated lesson list (user's lessons by id DESC)
+        Index("ix_lecciones_usuario_lista", "usuario_id", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     tema: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -135,6 +140,9 @@ class Conversacion(Base):
     """A chat conversation between a user and the AI tutor."""
 
     __tablename__ = "conversaciones"
+    __table_args__ = (
+        Index("ix_conversaciones_usuario_updated", "usuario_id", "updated_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     titulo: Mapped[str] = mapped_column(String(200), nullable=False, default="Nueva conversación")
@@ -151,7 +159,7 @@ class Conversacion(Base):
     usuario: Mapped["Usuario"] = relationship("Usuario", back_populates="conversaciones")
     mensajes: Mapped[list["Mensaje"]] = relationship(
         "Mensaje", back_populates="conversacion", cascade="all, delete-orphan",
-        order_by="Mensaje.created_at"
+        order_by="Mensaje.created_at", passive_deletes=True
     )
 
 
@@ -162,6 +170,10 @@ class Mensaje(Base):
     """Chat message exchanged between a user and the local AI tutor."""
 
     __tablename__ = "mensajes"
+    __table_args__ = (
+        # Serves chat history / message counts of a conversation
+        Index("ix_mensajes_conversacion_created", "conversacion_id", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     texto_usuario: Mapped[str] = mapped_column(Text, nullable=False)
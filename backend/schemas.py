@@ -2,14 +2,34 @@
 schemas.py – Pydantic v2 request / response schemas for PolyIA.
 """
 
-from pydantic import BaseModel, EmailStr, Field
+import re
+from typing import Annotated
+
+from pydantic import AfterValidator, BaseModel, Field
 
 
 # ---------------------------------------------------------------------------
 # Auth
 # ---------------------------------------------------------------------------
+# RFC 5321 path limit; EmailStr enforced it too and usuarios.email is 255 wide
+_EMAIL_MAX_LENGTH = 254
+_EMAIL_RE = re.compile(r"^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}$")
+
+
+def _normalize_email(value: str) -> str:
+    """Syntax-check an address; strip it and lowercase the domain like EmailStr."""
+    value = value.strip()
+    if len(value) > _EMAIL_MAX_LENGTH or not _EMAIL_RE.match(value):
+        raise ValueError("value is not a valid email address")
+    local, domain = value.rsplit("@", 1)
+    return f"{local}@{domain.lower()}"
+
+
+Email = Annotated[str, AfterValidator(_normalize_email)]
+
+
 class LoginRequest(BaseModel):
-    email: EmailStr
+    email: Email
     password: str = Field(min_length=6)
 
 
@@ -21,7 +41,7 @@ class TokenResponse(BaseModel):
 
 
 class RegisterRequest(BaseModel):
-    email: EmailStr
+    email: Email
     password: str = Field(min_length=6)
     nombre: str = Field(min_length=1, max_length=100)
 
@@ -94,6 +114,21 @@ class LeccionResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class LeccionResumenResponse(BaseModel):
+    """Lesson list item: LeccionResponse without the contenido / resultado blobs."""
+    id: int
+    tema: str
+    idioma: str
+    nivel: str
+    tipo_ejercicio: str
+    tema_categoria: str
+    completada: bool
+    puntuacion: int
+    proveedor_ia: str
+
+    model_config = {"from_attributes": True}
+
+
 class ProgresoResponse(BaseModel):
     idioma: str
     nivel_actual: str
@@ -71,17 +71,26 @@ Bubble.propTypes = {
 
 /* ── Lesson Picker Dropdown ───────────────────────────────────────── */
 
+const LESSONS_PAGE_SIZE = 20
+
 function LessonPicker({ onSelect, onClose }) {
   const [lessons, setLessons] = useState([])
   const [loading, setLoading] = useState(true)
-
-  useEffect(() => {
-    api.get('/api/leccion/lista').then(({ data }) => {
-      setLessons(data)
+  const [hasMore, setHasMore] = useState(false)
+
+  /** Fetch a page of lessons; pass the last loaded id to get the next page */
+  const fetchLessons = useCallback((beforeId = null) => {
+    const params = { limit: LESSONS_PAGE_SIZE }
+    if (beforeId) params.before_id = beforeId
+    api.get('/api/leccion/lista', { params }).then(({ data }) => {
+      setLessons((prev) => (beforeId ? [...prev, ...data] : data))
+      setHasMore(data.length === LESSONS_PAGE_SIZE)
       setLoading(false)
     }).catch(() => setLoading(false))
   }, [])
 
+  useEffect(() => { fetchLessons() }, [fetchLessons])
+
   return (
     <div className="absolute bottom-full left-0 mb-2 w-80 max-h-64 overflow-y-auto bg-card-light dark:bg-card-dark border border-gray-200 dark:border-gray-700 rounded-xl shadow-xl z-20">
       <div className="px-3 py-2 border-b border-gray-200 dark:border-gray-700 flex items-center justify-between">
@@ -115,6 +124,14 @@ function LessonPicker({ onSelect, onClose }) {
               </p>
             </button>
           ))}
+          {hasMore && (
+            <button
+              onClick={() => fetchLessons(lessons[lessons.length - 1].id)}
+              className="w-full text-center px-3 py-2 rounded-lg text-xs text-primary-600 dark:text-primary-400 hover:bg-gray-100 dark:hover:bg-gray-700 transition-colors"
+            >
+              Cargar más lecciones
+            </button>
+          )}
         </div>
       )}
     </div>
@@ -345,9 +362,15 @@ export default function ChatTutor() {
     }
   }
 
-  function handleLessonSelect(lesson) {
-    setAttachedLesson(lesson)
+  /** The picker only lists summaries: load the full lesson before attaching it */
+  async function handleLessonSelect(lesson) {
     setShowLessonPicker(false)
+    try {
+      const { data } = await api.get(`/api/leccion/${lesson.id}`)
+      setAttachedLesson(data)
+    } catch {
+      // ignore
+    }
   }
 
   return (
@@ -38,6 +38,7 @@ const TOPICS = [
 ]
 
 const LESSONS_TO_UNLOCK = 10
+const LESSONS_PAGE_SIZE = 20
 
 function getLevels(idioma) {
   return idioma === 'japones' ? LEVELS_JLPT : LEVELS_CEFR
@@ -63,9 +64,11 @@ export default function Dashboard() {
   const [generating, setGenerating] = useState(false)
   const [genError, setGenError] = useState('')
 
-  // Lessons list
+  // Lessons list (paginated, newest first) + overall totals
   const [lessons, setLessons] = useState([])
   const [loadingLessons, setLoadingLessons] = useState(true)
+  const [hasMoreLessons, setHasMoreLessons] = useState(false)
+  const [lessonTotals, setLessonTotals] = useState(null)
 
   // Profile modal
   const [showProfile, setShowProfile] = useState(false)
@@ -87,11 +90,14 @@ export default function Dashboard() {
     }
   }, [])
 
-  /** Fetch existing lessons */
-  const fetchLessons = useCallback(async () => {
+  /** Fetch a page of lessons in a language; pass the last loaded id to get the next page */
+  const fetchLessons = useCallback(async (lang, beforeId = null) => {
     try {
-      const { data } = await api.get('/api/leccion/lista')
-      setLessons(data)
+      const params = { limit: LESSONS_PAGE_SIZE, idioma: lang }
+      if (beforeId) params.before_id = beforeId
+      const { data } = await api.get('/api/leccion/lista', { params })
+      setLessons((prev) => (beforeId ? [...prev, ...data] : data))
+      setHasMoreLessons(data.length === LESSONS_PAGE_SIZE)
     } catch {
       // ignore
     } finally {
@@ -99,8 +105,22 @@ export default function Dashboard() {
     }
   }, [])
 
+  /** Fetch lesson totals (the list is paginated, so it cannot be counted) */
+  const fetchLessonTotals = useCallback(async () => {
+    try {
+      const { data } = await api.get('/api/estadisticas')
+      setLessonTotals(data.summary)
+    } catch {
+      // ignore
+    }
+  }, [])
+
   useEffect(() => { fetchProgress(idioma) }, [idioma, fetchProgress])
-  useEffect(() => { fetchLessons() }, [fetchLessons])
+  useEffect(() => {
+    setLoadingLessons(true)
+    fetchLessons(idioma)
+  }, [idioma, fetchLessons])
+  useEffect(() => { fetchLessonTotals() }, [fetchLessonTotals])
 
   // When language changes, reset level to the current unlocked
   useEffect(() => {
@@ -131,9 +151,6 @@ export default function Dashboard() {
   const unlocked = progreso?.niveles_desbloqueados || [levels[0]]
   const completedTopics = new Set(progreso?.temas_completados || [])
 
-  // Filter lessons for the selected language
-  const filteredLessons = lessons.filter((l) => l.idioma === idioma)
-
   return (
     <div className="min-h-screen bg-surface-light dark:bg-surface-dark transition-colors duration-300">
       {/* ── Top Navigation ── */}
@@ -371,8 +388,8 @@ export default function Dashboard() {
 
             {/* Stats */}
             <div className="grid grid-cols-2 gap-3">
-              <StatCard emoji="📚" label="Lecciones totales" value={loadingLessons ? '…' : lessons.length} />
-              <StatCard emoji="✅" label="Completadas" value={loadingLessons ? '…' : lessons.filter((l) => l.completada).length} />
+              <StatCard emoji="📚" label="Lecciones totales" value={lessonTotals ? lessonTotals.total_lessons : '…'} />
+              <StatCard emoji="✅" label="Completadas" value={lessonTotals ? lessonTotals.total_completed : '…'} />
               <StatCard emoji="🎯" label="Nivel actual" value={nivel} />
               <StatCard emoji="✨" label="Motor IA" value="Gemini" />
             </div>
@@ -386,16 +403,16 @@ export default function Dashboard() {
           </h3>
           {loadingLessons ? (
             <p className="text-gray-400 text-sm">Cargando…</p>
-          ) : filteredLessons.length === 0 ? (
+          ) : lessons.length === 0 ? (
             <p className="text-gray-400 text-sm">
               Aún no tienes lecciones en este idioma. ¡Genera tu primera lección!
             </p>
           ) : (
             <div className="grid grid-cols-1 sm:grid-cols-2 lg:grid-cols-3 gap-4">
-              {filteredLessons.map((l) => (
+              {lessons.map((l) => (
                 <button
                   key={l.id}
-                  onClick={() => navigate(`/leccion/${l.id}`, { state: { lesson: l } })}
+                  onClick={() => navigate(`/leccion/${l.id}`)}
                   className="card text-left transition-all hover:shadow-lg"
                 >
                   <div className="flex items-center justify-between mb-2">
@@ -414,6 +431,16 @@ export default function Dashboard() {
               ))}
             </div>
           )}
+          {!loadingLessons && hasMoreLessons && (
+            <div className="flex justify-center mt-4">
+              <button
+                onClick={() => fetchLessons(idioma, lessons[lessons.length - 1].id)}
+                className="btn-secondary"
+              >
+                Cargar más lecciones
+              </button>
+            </div>
+          )}
         </section>
       </main>
     </div>
@@ -1049,9 +1049,8 @@ export default function LessonExercise() {
   // Fetch lesson if not passed via navigation state
   useEffect(() => {
     if (!lesson) {
-      api.get('/api/leccion/lista').then(({ data }) => {
-        const found = data.find((l) => l.id === parseInt(id))
-        if (found) setLesson(found)
+      api.get(`/api/leccion/${id}`).then(({ data }) => {
+        setLesson(data)
         setLoading(false)
       }).catch(() => setLoading(false))
     }